@@ -5,7 +5,8 @@ from langgraph.graph import StateGraph, END
 from langchain_core.messages import BaseMessage
 from agents.research_agent import ResearchAgent
 from agents.answer_agent import AnswerAgent
-from utils.helpers import merge_research_results
+from agents.model_router import ModelRouter
+from utils.helpers import merge_research_results, merge_retrieval_stats
 
 class ResearchState(TypedDict):
     query: str
@@ -20,8 +21,9 @@ class AgentManager:
     """Manager for coordinating multiple agents in the research system."""
 
     def __init__(self):
-        self.research_agent = ResearchAgent()
-        self.answer_agent = AnswerAgent()
+        self.router = ModelRouter()
+        self.research_agent = ResearchAgent(self.router)
+        self.answer_agent = AnswerAgent(self.router)
 
     async def process_query(self, query: str, style: str = "academic") -> Dict[str, Any]:
         research_results = await self.research_agent.execute_research(query)
@@ -36,7 +38,9 @@ class AgentManager:
             "metadata": {
                 "research_plan": research_results.get("research_plan", {}),
                 "key_findings": research_results.get("synthesis", {}).get("key_findings", []),
-                "contradictions_gaps": research_results.get("synthesis", {}).get("contradictions_gaps", [])
+                "contradictions_gaps": research_results.get("synthesis", {}).get("contradictions_gaps", []),
+                "retrieval_stats": research_results.get("retrieval_stats", {}),
+                "model_stats": self.router.get_stats()
             }
         }
 
@@ -58,11 +62,13 @@ class AgentManager:
         results = await asyncio.gather(*tasks)
         all_synthesis = [result.get("synthesis", {}) for result in results]
         merged_synthesis = merge_research_results(all_synthesis)
+        retrieval_stats = merge_retrieval_stats([result.get("retrieval_stats", {}) for result in results])
 
         return {
             "query": query,
             "research_plan": plan,
-            "synthesis": merged_synthesis
+            "synthesis": merged_synthesis,
+            "retrieval_stats": retrieval_stats
         }
 
     def build_research_graph(self):
@@ -150,5 +156,9 @@ class AgentManager:
         sources = final_state.get("draft_answer", {}).get("sources", [])
 
         final_answer["sources"] = sources
+        final_answer["metadata"] = {
+            "retrieval_stats": final_state.get("research_results", {}).get("retrieval_stats", {}),
+            "model_stats": self.router.get_stats()
+        }
         return final_answer
 
@@ -1,8 +1,8 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import google.generativeai as genai
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from config import GEMINI_API_KEY, ANSWER_AGENT_MODEL
+from agents.model_router import ModelRouter
+from config import GEMINI_API_KEY
 from utils.helpers import format_sources
 
 genai.configure(api_key=GEMINI_API_KEY)
@@ -10,8 +10,8 @@ genai.configure(api_key=GEMINI_API_KEY)
 class AnswerAgent:
     """Agent responsible for drafting comprehensive answers based on research."""
 
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(model=ANSWER_AGENT_MODEL, google_api_key=GEMINI_API_KEY)
+    def __init__(self, router: Optional[ModelRouter] = None):
+        self.router = router or ModelRouter()
 
         self.system_prompt = """You are an expert answer drafter specialized in turning research findings into comprehensive, accurate, and well-structured responses. Your task is to:
 
@@ -76,7 +76,7 @@ Your answer should be authoritative, informative, and engaging.
 """)
         ]
 
-        response = await self.llm.ainvoke(messages)
+        response = await self.router.ainvoke("draft", messages)
 
         return {
             "query": query,
@@ -108,7 +108,7 @@ Please preserve all factual information and citations, but restructure and rewri
 """)
         ]
 
-        response = await self.llm.ainvoke(messages)
+        response = await self.router.ainvoke("refine", messages)
 
         refined_answer = draft_answer.copy()
         refined_answer["refined_answer"] = response.content
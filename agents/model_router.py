@@ -0,0 +1,191 @@
+from typing import Dict, List, Any, Optional
+import asyncio
+import json
+import os
+import time
+from langchain_core.messages import BaseMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+from config import (GEMINI_API_KEY, STAGE_MODELS, LATENCY_ROUTED_STAGES,
+                    STAGE_TIMEOUT_SECONDS, MODEL_MAX_RETRIES, MODEL_STATS_PATH)
+
+# Weight given to the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.3
+# Seconds a model stays demoted for a stage after it times out or errors
+FAILURE_COOLDOWN_SECONDS = 120
+
+class ModelRouter:
+    """Routes each pipeline stage to a model, falling back on timeout or error and tracking observed latency."""
+
+    def __init__(self, stage_models: Optional[Dict[str, List[str]]] = None,
+                 stage_timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 stats_path: Optional[str] = MODEL_STATS_PATH):
+        self.stage_models = stage_models or STAGE_MODELS
+        self.stage_timeouts = stage_timeouts or STAGE_TIMEOUT_SECONDS
+        self.stats_path = stats_path
+        self._llms = {}
+        self._stage_stats = {}
+        # Routing stats include earlier runs (see load_stats); run_stats covers only this run
+        self.model_stats = {}
+        self.run_stats = {}
+        self.load_stats()
+
+    def _get_llm(self, model: str, fail_fast: bool) -> ChatGoogleGenerativeAI:
+        key = (model, fail_fast)
+        if key not in self._llms:
+            kwargs = {"max_retries": MODEL_MAX_RETRIES} if fail_fast else {}
+            self._llms[key] = ChatGoogleGenerativeAI(model=model, google_api_key=GEMINI_API_KEY, **kwargs)
+        return self._llms[key]
+
+    def _expected_seconds(self, stage: str, candidates: List[str]) -> Dict[str, Optional[float]]:
+        stage_latency = {model: self._stage_stats.get((stage, model), {}).get("latency") for model in candidates}
+        if all(latency is not None for latency in stage_latency.values()):
+            return stage_latency
+
+        # Not every candidate has run this stage: compare them all on their average call time,
+        # scaled by how much output this stage typically produces
+        calls = sum(s["calls"] for (name, _), s in self._stage_stats.items() if name == stage)
+        tokens = sum(s["output_tokens"] for (name, _), s in self._stage_stats.items() if name == stage)
+        stage_tokens = tokens / calls if calls else 0
+
+        expected = {}
+        for model in candidates:
+            stats = self.model_stats.get(model, {})
+            if not stats.get("calls"):
+                expected[model] = None
+                continue
+            avg_seconds = stats["seconds"] / stats["calls"]
+            avg_tokens = stats["output_tokens"] / stats["calls"]
+            expected[model] = avg_seconds * stage_tokens / avg_tokens if stage_tokens and avg_tokens else avg_seconds
+        return expected
+
+    def rank_models(self, stage: str) -> List[str]:
+        """Return the candidate models for a stage in the order they should be tried."""
+        candidates = self.stage_models.get(stage, [])
+        now = time.monotonic()
+
+        def recently_failed(model: str) -> bool:
+            last_failure = self._stage_stats.get((stage, model), {}).get("last_failure")
+            return last_failure is not None and now - last_failure < FAILURE_COOLDOWN_SECONDS
+
+        # Only reorder by latency once every candidate can be compared; otherwise keep the configured order
+        expected = self._expected_seconds(stage, candidates) if stage in LATENCY_ROUTED_STAGES else {}
+        by_latency = bool(expected) and all(seconds is not None for seconds in expected.values())
+
+        def sort_key(model: str):
+            index = candidates.index(model)
+            return (recently_failed(model), expected[model] if by_latency else 0.0, index)
+
+        return sorted(candidates, key=sort_key)
+
+    def _record(self, stage: str, model: str, seconds: float, output_tokens: int = 0,
+                failed: bool = False, timed_out: bool = False):
+        stage_stats = self._stage_stats.setdefault((stage, model), {
+            "calls": 0, "failures": 0, "last_failure": None, "latency": None, "output_tokens": 0
+        })
+        counters = [
+            stats.setdefault(model, {"calls": 0, "failures": 0, "seconds": 0.0, "output_tokens": 0})
+            for stats in (self.model_stats, self.run_stats)
+        ]
+
+        # A timeout is a latency sample too, so a model that keeps timing out loses its place even across runs
+        if not failed or timed_out:
+            if stage_stats["latency"] is None:
+                stage_stats["latency"] = seconds
+            else:
+                stage_stats["latency"] = LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * stage_stats["latency"]
+
+        if failed:
+            stage_stats["failures"] += 1
+            stage_stats["last_failure"] = time.monotonic()
+            for model_stats in counters:
+                model_stats["failures"] += 1
+            return
+
+        stage_stats["calls"] += 1
+        stage_stats["last_failure"] = None
+        stage_stats["output_tokens"] += output_tokens
+
+        for model_stats in counters:
+            model_stats["calls"] += 1
+            model_stats["seconds"] += seconds
+            model_stats["output_tokens"] += output_tokens
+
+    async def ainvoke(self, stage: str, messages: List[BaseMessage]) -> Any:
+        """
+        Invoke the best model for a stage, trying the next candidate on timeout or error.
+
+        Args:
+            stage: The pipeline stage (plan, synthesize, draft, refine)
+            messages: The messages to send to the model
+
+        Returns:
+            The model response; the model that produced it is stored in its response_metadata
+        """
+        last_error = None
+        fail_fast = stage in LATENCY_ROUTED_STAGES
+        timeout = self.stage_timeouts.get(stage)
+
+        for model in self.rank_models(stage):
+            start = time.perf_counter()
+            try:
+                call = self._get_llm(model, fail_fast).ainvoke(messages)
+                response = await asyncio.wait_for(call, timeout=timeout) if timeout else await call
+            except asyncio.TimeoutError as e:
+                self._record(stage, model, max(time.perf_counter() - start, timeout or 0), failed=True, timed_out=True)
+                last_error = e
+                continue
+            except Exception as e:
+                self._record(stage, model, time.perf_counter() - start, failed=True)
+                last_error = e
+                continue
+
+            usage = getattr(response, "usage_metadata", None) or {}
+            output_tokens = usage.get("output_tokens") or len(str(response.content)) // 4
+            self._record(stage, model, time.perf_counter() - start, output_tokens)
+            response.response_metadata["routed_model"] = model
+            return response
+
+        raise last_error or RuntimeError(f"No models configured for stage: {stage}")
+
+    def load_stats(self):
+        """Load latency and throughput observed in earlier runs."""
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return
+
+        try:
+            with open(self.stats_path) as f:
+                saved = json.load(f)
+        except Exception:
+            return
+
+        self.model_stats = saved.get("models", {})
+        for stage, models in saved.get("stages", {}).items():
+            for model, stats in models.items():
+                self._stage_stats[(stage, model)] = dict(stats, last_failure=None)
+
+    def save_stats(self):
+        """Save observed latency and throughput so later runs can route on them."""
+        if not self.stats_path:
+            return
+
+        stages = {}
+        for (stage, model), stats in self._stage_stats.items():
+            stages.setdefault(stage, {})[model] = {key: value for key, value in stats.items() if key != "last_failure"}
+
+        try:
+            with open(self.stats_path, "w") as f:
+                json.dump({"models": self.model_stats, "stages": stages}, f, indent=2)
+        except OSError:
+            pass
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize latency and token throughput per model for this run."""
+        summary = {}
+        for model, stats in self.run_stats.items():
+            summary[model] = {
+                "calls": stats["calls"],
+                "failures": stats["failures"],
+                "avg_seconds": stats["seconds"] / stats["calls"] if stats["calls"] else 0.0,
+                "tokens_per_second": stats["output_tokens"] / stats["seconds"] if stats["seconds"] else 0.0
+            }
+        return summary
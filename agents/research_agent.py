@@ -1,19 +1,19 @@
 from typing import Dict, List, Any, Optional
 import google.generativeai as genai
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from config import GEMINI_API_KEY, RESEARCH_AGENT_MODEL
+from agents.model_router import ModelRouter
+from config import GEMINI_API_KEY, TWO_PHASE_RETRIEVAL, FULL_CONTENT_TOP_K, MEASURE_RETRIEVAL_BASELINE
 from tools.tavily_tools import TavilySearchTool
-from utils.helpers import extract_key_info, format_sources
+from utils.helpers import extract_key_info, format_sources, rank_sources
 
 genai.configure(api_key=GEMINI_API_KEY)
 
 class ResearchAgent:
     """Agent responsible for researching information on a given topic."""
 
-    def __init__(self):
+    def __init__(self, router: Optional[ModelRouter] = None):
         self.search_tool = TavilySearchTool()
-        self.llm = ChatGoogleGenerativeAI(model=RESEARCH_AGENT_MODEL, google_api_key=GEMINI_API_KEY)
+        self.router = router or ModelRouter()
 
         self.system_prompt = """You are an expert research agent. Your task is to gather comprehensive information on topics by:
 1. Breaking down complex queries into specific research questions
@@ -43,7 +43,7 @@ Format your response as a JSON with the following structure:
 }}""")
         ]
 
-        response = await self.llm.ainvoke(messages)
+        response = await self.router.ainvoke("plan", messages)
         response_text = response.content
 
         try:
@@ -63,44 +63,73 @@ Format your response as a JSON with the following structure:
 
     async def execute_research(self, query: str) -> Dict[str, Any]:
         research_plan = await self.generate_research_plan(query)
-        search_results = []
-
-        main_results = await self.search_tool.search(query, search_depth=2)
-        search_results.append(main_results)
+        search_queries = [(query, 2)]
 
         for question in research_plan.get("research_questions", []):
             if question != query:
-                results = await self.search_tool.search(question)
-                search_results.append(results)
+                search_queries.append((question, 1))
 
         for subtopic in research_plan.get("subtopics", [])[:3]:
-            sub_query = f"{query} {subtopic}"
-            results = await self.search_tool.search(sub_query)
+            search_queries.append((f"{query} {subtopic}", 1))
+
+        search_results = []
+        for search_query, search_depth in search_queries:
+            results = await self.search_tool.search(search_query, search_depth=search_depth,
+                                                    include_raw_content=not TWO_PHASE_RETRIEVAL)
             search_results.append(results)
 
-        synthesis = await self._synthesize_research(query, search_results, research_plan)
+        ranked_sources = rank_sources(search_results)
+        retrieval_stats = {
+            "searches": len(search_results),
+            "search_bytes": sum(result.get("bytes", 0) for result in search_results),
+            "search_seconds": sum(result.get("seconds", 0.0) for result in search_results),
+            "candidate_sources": len(ranked_sources)
+        }
+
+        if TWO_PHASE_RETRIEVAL:
+            selected = [source for source in ranked_sources[:FULL_CONTENT_TOP_K] if source.get("url")]
+            fetched = await self.search_tool.fetch_content([source["url"] for source in selected])
+
+            for source in selected:
+                if source["url"] in fetched["contents"]:
+                    source["raw_content"] = fetched["contents"][source["url"]]
+
+            retrieval_stats.update({
+                "fetched_sources": len(fetched["fetched"]),
+                "failed_fetches": len(fetched["failed"]),
+                "cache_hits": len(fetched["cache_hits"]),
+                "fetch_requests": fetched["requests"],
+                "fetch_bytes": fetched["bytes"],
+                "fetch_seconds": fetched["seconds"]
+            })
+
+            if MEASURE_RETRIEVAL_BASELINE:
+                # Re-run the same searches the way single-phase retrieval does, for a measured comparison
+                baseline_results = []
+                for search_query, search_depth in search_queries:
+                    baseline_results.append(await self.search_tool.search(search_query, search_depth=search_depth))
+
+                retrieval_stats.update({
+                    "baseline_bytes": sum(result.get("bytes", 0) for result in baseline_results),
+                    "baseline_seconds": sum(result.get("seconds", 0.0) for result in baseline_results)
+                })
+
+        synthesis = await self._synthesize_research(query, search_results, research_plan, ranked_sources)
 
         return {
             "query": query,
             "research_plan": research_plan,
             "raw_search_results": search_results,
-            "synthesis": synthesis
+            "synthesis": synthesis,
+            "retrieval_stats": retrieval_stats
         }
 
-    async def _synthesize_research(self, query: str, search_results: List[Dict[str, Any]], research_plan: Dict[str, Any]) -> Dict[str, Any]:
-        all_sources = []
-        all_answers = []
-
-        for result in search_results:
-            for source in result.get("sources", []):
-                if source not in all_sources:
-                    all_sources.append(source)
-            if result.get("answer"):
-                all_answers.append(result["answer"])
+    async def _synthesize_research(self, query: str, search_results: List[Dict[str, Any]], research_plan: Dict[str, Any],
+                                   all_sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        all_answers = [result["answer"] for result in search_results if result.get("answer")]
 
         source_excerpts = "\n\n".join([
-            f"Source {i+1}: {source.get('title', 'Untitled')}\n{extract_key_info(source.get('content', ''))}"
-            for i, source in enumerate(all_sources[:10])
+            self._format_excerpt(i, source) for i, source in enumerate(all_sources[:10])
         ])
 
         messages = [
@@ -129,7 +158,7 @@ Format your response as a JSON with the following structure:
 """)
         ]
 
-        response = await self.llm.ainvoke(messages)
+        response = await self.router.ainvoke("synthesize", messages)
         response_text = response.content
 
         try:
@@ -157,3 +186,10 @@ Format your response as a JSON with the following structure:
 
         synthesis_results["sources"] = all_sources
         return synthesis_results
+
+    def _format_excerpt(self, index: int, source: Dict[str, Any]) -> str:
+        excerpt = f"Source {index+1}: {source.get('title', 'Untitled')}\n{extract_key_info(source.get('content', ''))}"
+        # Page text fetched in the second retrieval phase supplements the snippet rather than replacing it
+        if TWO_PHASE_RETRIEVAL and source.get("raw_content"):
+            excerpt += f"\nPage content: {extract_key_info(source['raw_content'])}"
+        return excerpt
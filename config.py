@@ -9,6 +9,36 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 RESEARCH_AGENT_MODEL = "models/gemini-2.0-flash"
 ANSWER_AGENT_MODEL = "models/gemini-2.0-flash"
+FAST_MODEL = "models/gemini-2.0-flash-lite"
+
+# Candidate models per stage, in order of preference; later entries are fallbacks
+STAGE_MODELS = {
+    "plan": [FAST_MODEL, RESEARCH_AGENT_MODEL],
+    "synthesize": [FAST_MODEL, RESEARCH_AGENT_MODEL],
+    "draft": [ANSWER_AGENT_MODEL, FAST_MODEL],
+    "refine": [ANSWER_AGENT_MODEL, FAST_MODEL]
+}
+# Stages where the fastest observed candidate is preferred over the configured order.
+# These also fail fast: fewer library retries before falling back to the next candidate.
+LATENCY_ROUTED_STAGES = ["plan", "synthesize"]
+MODEL_MAX_RETRIES = 1
+# Per-stage timeout before falling back; None waits for the model (and its retries) to finish
+STAGE_TIMEOUT_SECONDS = {
+    "plan": 30,
+    "synthesize": 60,
+    "draft": None,
+    "refine": None
+}
+# Observed model latency is kept here between runs
+MODEL_STATS_PATH = ".model_stats.json"
+
 MAX_RESULTS = 5
 SEARCH_DEPTH = 2
 MAX_CONCURRENT_REQUESTS = 3
+
+# Two-phase retrieval: snippet-only searches first, raw page content only for the top-ranked sources
+TWO_PHASE_RETRIEVAL = True
+FULL_CONTENT_TOP_K = 10
+EXTRACT_BATCH_SIZE = 5
+# Also run the old raw-content searches to measure what two-phase retrieval saves (doubles search cost)
+MEASURE_RETRIEVAL_BASELINE = False
@@ -8,6 +8,7 @@ import google.generativeai as genai
 
 from config import GEMINI_API_KEY, TAVILY_API_KEY
 from agents.agent_manager import AgentManager
+from utils.helpers import format_retrieval_stats, format_model_stats
 
 load_dotenv()
 genai.configure(api_key=GEMINI_API_KEY)
@@ -62,11 +63,16 @@ async def main():
             print("Drafting final answer based on multi-agent research...")
             final_response = await manager.answer_agent.draft_answer(query, research_results)
             final_response = await manager.answer_agent.refine_answer(final_response, style)
+            final_response["metadata"] = {
+                "retrieval_stats": research_results.get("retrieval_stats", {}),
+                "model_stats": manager.router.get_stats()
+            }
         else:
             
             print("Processing query with standard pipeline...")
             final_response = await manager.process_query(query, style)
     
+    manager.router.save_stats()
     
     print("\n" + "="*80)
     print(f"ANSWER TO: {query}")
@@ -87,6 +93,15 @@ async def main():
         print(f"   Published: {source.get('published_date', 'Unknown date')}")
         print()
     
+    retrieval_stats = final_response.get("metadata", {}).get("retrieval_stats", {})
+    if retrieval_stats:
+        print("="*80)
+        print(format_retrieval_stats(retrieval_stats))
+    
+    model_stats = final_response.get("metadata", {}).get("model_stats", {})
+    if model_stats:
+        print(format_model_stats(model_stats))
+    
     # Save output if requested
     if args.output:
         with open(args.output, "w") as f:
@@ -1,14 +1,30 @@
+import asyncio
+import json
+import time
 from typing import Dict, List, Any, Optional
 from tavily import TavilyClient
-from config import TAVILY_API_KEY, MAX_RESULTS
+from config import TAVILY_API_KEY, MAX_RESULTS, MAX_CONCURRENT_REQUESTS, EXTRACT_BATCH_SIZE
+from utils.helpers import normalize_url
+
+
+def _payload_bytes(payload: Any) -> int:
+    """Approximate the transferred size of an API response."""
+    try:
+        return len(json.dumps(payload, default=str).encode("utf-8"))
+    except Exception:
+        return 0
 
 class TavilySearchTool:
     """Tool for searching the web using Tavily API."""
     
     def __init__(self):
         self.client = TavilyClient(api_key=TAVILY_API_KEY)
+        # Shared by every caller so concurrent agents stay within MAX_CONCURRENT_REQUESTS
+        self._extract_semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_REQUESTS))
+        self._content_cache = {}
     
-    async def search(self, query: str, search_depth: int = 1, max_results: int = MAX_RESULTS) -> Dict[str, Any]:
+    async def search(self, query: str, search_depth: int = 1, max_results: int = MAX_RESULTS,
+                     include_raw_content: bool = True) -> Dict[str, Any]:
         """
         Perform a search on Tavily.
         
@@ -16,18 +32,20 @@ class TavilySearchTool:
             query: The search query
             search_depth: How deep to search (1-3)
             max_results: Maximum number of results to return
+            include_raw_content: Whether to return full page content or only snippets
             
         Returns:
             Dictionary containing search results and metadata
         """
         try:
+            start = time.perf_counter()
             response = self.client.search(
                 query=query,
                 search_depth=search_depth,
                 max_results=max_results,
                 include_answer=True,
                 include_images=False,
-                include_raw_content=True
+                include_raw_content=include_raw_content
             )
             
             
@@ -35,7 +53,9 @@ class TavilySearchTool:
                 "query": query,
                 "answer": response.get("answer", ""),
                 "sources": response.get("results", []),
-                "raw_search_results": response
+                "raw_search_results": response,
+                "bytes": _payload_bytes(response),
+                "seconds": time.perf_counter() - start
             }
             
             return results
@@ -92,4 +112,82 @@ class TavilySearchTool:
             "answer": combined_answer,
             "sources": combined_sources,
             "subtopics": subtopics or []
-        }
\ No newline at end of file
+        }
+    
+    async def _extract_batch(self, urls: List[str]) -> Dict[str, Any]:
+        async with self._extract_semaphore:
+            try:
+                response = await asyncio.to_thread(self.client.extract, urls=urls)
+            except Exception:
+                return {"contents": {}, "bytes": 0}
+        
+        contents = {}
+        for result in response.get("results", []):
+            if result.get("url") and result.get("raw_content"):
+                contents[normalize_url(result["url"])] = result["raw_content"]
+        
+        return {"contents": contents, "bytes": _payload_bytes(response)}
+    
+    async def fetch_content(self, urls: List[str], batch_size: int = EXTRACT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Fetch the full page content for a selected set of URLs.
+        
+        URLs are sent in batched extract requests. Pages already fetched or being fetched
+        by another caller are reused rather than requested again.
+        
+        Args:
+            urls: The URLs to fetch
+            batch_size: Maximum number of URLs per extract request
+            
+        Returns:
+            Dictionary mapping each URL to its raw content, plus byte and timing metadata.
+            The fetched/failed lists, requests, bytes and seconds cover only the URLs this
+            call requested; pages served by another caller's fetch are listed as cache_hits.
+        """
+        loop = asyncio.get_running_loop()
+        
+        keys = {url: normalize_url(url) for url in urls}
+        new_urls = {}
+        for url, key in keys.items():
+            if key not in self._content_cache:
+                self._content_cache[key] = loop.create_future()
+                new_urls[key] = url
+        # Held here because failed keys are removed from the cache before they are awaited
+        futures = {key: self._content_cache[key] for key in keys.values()}
+        
+        pending = list(new_urls.items())
+        batch_size = max(1, batch_size)
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        
+        start = time.perf_counter()
+        fetched = []
+        try:
+            fetched = await asyncio.gather(*[self._extract_batch([url for _, url in batch]) for batch in batches])
+            for batch, result in zip(batches, fetched):
+                for key, _ in batch:
+                    futures[key].set_result(result["contents"].get(key, ""))
+        finally:
+            # Only successful pages stay cached; failed or interrupted ones can be retried by the next caller
+            for key in new_urls:
+                if not futures[key].done():
+                    futures[key].set_result("")
+                if not futures[key].result() and self._content_cache.get(key) is futures[key]:
+                    del self._content_cache[key]
+        seconds = time.perf_counter() - start
+        
+        contents = {}
+        for url, key in keys.items():
+            raw_content = await futures[key]
+            if raw_content:
+                contents[url] = raw_content
+        
+        requested = set(new_urls.values())
+        return {
+            "contents": contents,
+            "fetched": [url for url in requested if url in contents],
+            "failed": [url for url in requested if url not in contents],
+            "cache_hits": [url for url in contents if url not in requested],
+            "requests": len(batches),
+            "bytes": sum(result["bytes"] for result in fetched),
+            "seconds": seconds if batches else 0.0
+        }
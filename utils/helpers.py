@@ -1,5 +1,6 @@
 import json
 from typing import Dict, List, Any
+from urllib.parse import urlsplit, urlunsplit
 
 def format_sources(sources: List[Dict[str, Any]]) -> str:
     """Format sources into a readable string with numbered references."""
@@ -49,4 +50,81 @@ def merge_research_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     merged["extracted_information"] = "\n\n".join(all_texts)
     
-    return merged
\ No newline at end of file
+    return merged
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so the same page found by different queries compares equal."""
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+def rank_sources(search_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Deduplicate sources across search results and rank them by query coverage and score."""
+    candidates = {}
+    
+    for result in search_results:
+        for source in result.get("sources", []):
+            url = source.get("url")
+            if not url:
+                continue
+            
+            key = normalize_url(url)
+            if key not in candidates:
+                candidates[key] = {"source": dict(source), "hits": 0, "score": 0.0}
+            
+            candidate = candidates[key]
+            candidate["hits"] += 1
+            candidate["score"] = max(candidate["score"], source.get("score") or 0.0)
+    
+    ranked = sorted(candidates.values(), key=lambda c: (c["hits"], c["score"]), reverse=True)
+    return [candidate["source"] for candidate in ranked]
+
+def merge_retrieval_stats(stats_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum retrieval statistics from several research runs."""
+    merged = {}
+    
+    for stats in stats_list:
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+    
+    return merged
+
+def format_retrieval_stats(stats: Dict[str, Any]) -> str:
+    """Format retrieval statistics into a short run summary."""
+    if not stats:
+        return "No retrieval statistics available."
+    
+    search_bytes = stats.get("search_bytes", 0)
+    search_seconds = stats.get("search_seconds", 0.0)
+    fetch_bytes = stats.get("fetch_bytes", 0)
+    fetch_seconds = stats.get("fetch_seconds", 0.0)
+    
+    formatted = "Retrieval:\n"
+    formatted += f"   Searches: {stats.get('searches', 0)} ({search_bytes / 1024:.1f} KB, {search_seconds:.2f}s)\n"
+    formatted += f"   Candidate sources: {stats.get('candidate_sources', 0)}\n"
+    if "fetched_sources" in stats:
+        formatted += f"   Full content fetched: {stats['fetched_sources']} sources, {stats.get('failed_fetches', 0)} failed, "
+        formatted += f"{stats.get('cache_hits', 0)} reused, "
+        formatted += f"{stats.get('fetch_requests', 0)} requests ({fetch_bytes / 1024:.1f} KB, {fetch_seconds:.2f}s)\n"
+    
+    # Only reported when the raw-content searches were actually run for comparison
+    if "baseline_bytes" in stats:
+        bytes_saved = stats["baseline_bytes"] - search_bytes - fetch_bytes
+        seconds_saved = stats.get("baseline_seconds", 0.0) - search_seconds - fetch_seconds
+        formatted += f"   Raw-content searches (measured baseline): {stats['baseline_bytes'] / 1024:.1f} KB, {stats.get('baseline_seconds', 0.0):.2f}s\n"
+        formatted += f"   Saved vs baseline: {bytes_saved / 1024:.1f} KB, {seconds_saved:.2f}s\n"
+    
+    return formatted
+
+def format_model_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """Format per-model latency and throughput into a short run summary."""
+    if not stats:
+        return "No model statistics available."
+    
+    formatted = "Models:\n"
+    for model, model_stats in stats.items():
+        formatted += f"   {model}: {model_stats.get('calls', 0)} calls, {model_stats.get('failures', 0)} failures, "
+        formatted += f"{model_stats.get('avg_seconds', 0.0):.2f}s avg, {model_stats.get('tokens_per_second', 0.0):.1f} tokens/s\n"
+    
+    return formatted